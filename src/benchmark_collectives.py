@@ -86,14 +86,13 @@ def psum_benchmark(
             matrix, jax.sharding.NamedSharding(mesh, P("dcn", None))
         )
         jitted_op = jax.jit(f)
-        for _ in range(num_runs):
-            dcn_average_time_ms_list = simple_timeit(
-                jitted_op,
-                sharded_matrix,
-                tries=num_runs,
-                task="psum_dcn_op",
-                trace_dir=trace_dir,
-            )
+        dcn_average_time_ms_list = simple_timeit(
+            jitted_op,
+            sharded_matrix,
+            tries=num_runs,
+            task="psum_dcn_op",
+            trace_dir=trace_dir,
+        )
 
     # ICI benchmark
     if ici_size > 1:
@@ -220,14 +219,13 @@ def psum_scatter_benchmark(
         )
         jitted_op = jax.jit(f)
 
-        for _ in range(num_runs):
-            dcn_average_time_ms_list = simple_timeit(
-                jitted_op,
-                sharded_matrix,
-                tries=num_runs,
-                task="psum_scatter_dcn_op",
-                trace_dir=trace_dir,
-            )
+        dcn_average_time_ms_list = simple_timeit(
+            jitted_op,
+            sharded_matrix,
+            tries=num_runs,
+            task="psum_scatter_dcn_op",
+            trace_dir=trace_dir,
+        )
 
     # ICI benchmark
     if ici_size > 1:
@@ -356,14 +354,13 @@ def all_gather_benchmark(
         )
         jitted_op = jax.jit(f)
 
-        for _ in range(num_runs):
-            dcn_average_time_ms_list = simple_timeit(
-                jitted_op,
-                sharded_matrix,
-                tries=num_runs,
-                task="all_gather_dcn_op",
-                trace_dir=trace_dir,
-            )
+        dcn_average_time_ms_list = simple_timeit(
+            jitted_op,
+            sharded_matrix,
+            tries=num_runs,
+            task="all_gather_dcn_op",
+            trace_dir=trace_dir,
+        )
 
     # ICI benchmark
     if ici_size > 1:
@@ -498,14 +495,13 @@ def ppermute_benchmark(
         )
         jitted_op = jax.jit(f)
 
-        for _ in range(num_runs):
-            dcn_average_time_ms_list = simple_timeit(
-                jitted_op,
-                sharded_matrix,
-                tries=num_runs,
-                task="ppermute_dcn_op",
-                trace_dir=trace_dir,
-            )
+        dcn_average_time_ms_list = simple_timeit(
+            jitted_op,
+            sharded_matrix,
+            tries=num_runs,
+            task="ppermute_dcn_op",
+            trace_dir=trace_dir,
+        )
 
     # ICI benchmark
     if ici_size > 1:
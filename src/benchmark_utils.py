@@ -2,21 +2,23 @@
 
 import datetime
 import os
-from typing import Dict, Any
+from typing import Dict, Any, List, Union
 import glob
 
 import jax
 import jsonlines
 import numpy as np
-import random
-import string
 import pathlib
 import gzip
 import json
 import re
-from collections import defaultdict
 import subprocess
 import shutil
+import tempfile
+import uuid
+
+# Extracts the 'module_XXXX.jit_f.[unique_id]' prefix from an XLA dump filename.
+_XLA_DUMP_JIT_ID_RE = re.compile(r"(module.*jit_f\.[^.]+)")
 
 
 def simple_timeit(f, *args, tries=10, task=None, trace_dir=None) -> float:
@@ -65,25 +67,25 @@ def get_metrics_from_trace(trace: dict[str, Any], task: str) -> float:
     if "traceEvents" not in trace:
         raise KeyError("Key 'traceEvents' not found in trace.")
 
-    events = []
-    for e in trace["traceEvents"]:
-        if "name" in e and event_matcher.match(e["name"]):
-            events.append(e)
-
-    events_by_run_id = defaultdict(list)
-    for e in events:
-        run_id = e["args"]["run_id"] if "args" in e and "run_id" in e["args"] else "0"
-        events_by_run_id[run_id].append(e)
-    durations_ms = []
+    # Keep only the longest matching event per run id, in a single pass over
+    # the trace, instead of grouping every event into per-run lists first.
+    max_dur_us_by_run_id = {}
     try:
-        # Duration is in us.
-        durations_ms = [
-            max([e["dur"] for e in es]) / 1e3 for run_id, es in events_by_run_id.items()
-        ]
+        for e in trace["traceEvents"]:
+            if "name" not in e or not event_matcher.match(e["name"]):
+                continue
+            run_id = e["args"]["run_id"] if "args" in e and "run_id" in e["args"] else "0"
+            # Duration is in us.
+            dur_us = e["dur"]
+            if (
+                run_id not in max_dur_us_by_run_id
+                or dur_us > max_dur_us_by_run_id[run_id]
+            ):
+                max_dur_us_by_run_id[run_id] = dur_us
     except KeyError:
         print("KeyError: Key 'dur' not found in the event object")
         raise
-    return durations_ms
+    return [dur_us / 1e3 for dur_us in max_dur_us_by_run_id.values()]
 
 
 def is_local_directory_path(dir: str) -> bool:
@@ -105,9 +107,7 @@ def timeit_from_trace(f, *args, tries=10, task=None, trace_dir=None) -> float:
 
     jax.block_until_ready(f(*args))  # warm it up!
 
-    trace_name = f"t_{task}_" + "".join(
-        random.choices(string.ascii_uppercase + string.digits, k=10)
-    )
+    trace_name = f"t_{task}_{uuid.uuid4().hex[:10].upper()}"
     trace_full_dir = f"{trace_dir}/{trace_name}"
     tmp_trace_dir = trace_full_dir
     # If the trace_dir isn't a local path, create one for dumping the trace for parsing and getting metrics.
@@ -127,17 +127,10 @@ def timeit_from_trace(f, *args, tries=10, task=None, trace_dir=None) -> float:
     return get_metrics_from_trace(trace, task)
 
 
-def maybe_write_metrics_file(
-    metrics_dir, metrics, metadata, test_name, test_start_time, test_end_time
-):
-    """Writes metrics to a JSONL file to be consumed by the XLML metrics pipeline."""
-
-    # Only write metrics from one host.
-    if jax.process_index() != 0:
-        return
-
-    jsonl_name = "metrics_report.jsonl"
-    jsonl_path = metrics_dir + "/" + jsonl_name
+def build_metrics_record(
+    metrics, metadata, test_name, test_start_time, test_end_time
+) -> Dict[str, Any]:
+    """Builds a metrics record in the format consumed by the XLML metrics pipeline."""
     metadata.update(
         {
             "testsuite": "microbenchmark",
@@ -153,24 +146,59 @@ def maybe_write_metrics_file(
     # Make sure the metadata value is a string.
     for key, value in metadata.items():
         metadata[key] = str(value)
+    return metrics_data
+
+
+def maybe_write_metrics_records(metrics_dir, metrics_records: List[Dict[str, Any]]):
+    """Appends a batch of metrics records to the JSONL file in a single write."""
+
+    # Only write metrics from one host.
+    if jax.process_index() != 0 or not metrics_records:
+        return
+
+    jsonl_name = "metrics_report.jsonl"
+    jsonl_path = metrics_dir + "/" + jsonl_name
 
     # Ensure the directory exists
     os.makedirs(os.path.dirname(jsonl_path), exist_ok=True)
 
-    print(f"Writing metrics to JSONL file: {jsonl_path}")
+    print(f"Writing {len(metrics_records)} metrics to JSONL file: {jsonl_path}")
     with jsonlines.open(jsonl_path, mode="a") as writer:
-        writer.write(metrics_data)
+        writer.write_all(metrics_records)
+
+
+def maybe_write_metrics_file(
+    metrics_dir, metrics, metadata, test_name, test_start_time, test_end_time
+):
+    """Writes metrics to a JSONL file to be consumed by the XLML metrics pipeline."""
+
+    # Only write metrics from one host.
+    if jax.process_index() != 0:
+        return
+
+    maybe_write_metrics_records(
+        metrics_dir,
+        [
+            build_metrics_record(
+                metrics, metadata, test_name, test_start_time, test_end_time
+            )
+        ],
+    )
 
 
-def upload_to_storage(trace_dir: str, local_file: str):
+def upload_to_storage(trace_dir: str, local_file: Union[str, List[str]]):
     """
-    Uploads a local file to a specified storage location.
+    Uploads one or more local files to a specified storage location.
+
+    Multiple files are sent in a single parallel (-m) gsutil invocation, so the
+    gsutil startup cost is paid once rather than per file.
     """
+    local_files = [local_file] if isinstance(local_file, str) else list(local_file)
 
     if trace_dir.startswith("gs://"):  # Google Cloud Storage (GCS)
         try:
             subprocess.run(
-                ["gsutil", "cp", "-r", local_file, trace_dir],
+                ["gsutil", "-m", "cp", "-r", *local_files, trace_dir],
                 check=True,
                 capture_output=True,
             )
@@ -249,7 +277,7 @@ def rename_xla_dump(
     # Example: 'module_0080.jit_f.cl_747713181.before_optimizations.txt'
     # This will extract 'module_0080.jit_f.cl_747713181'
     filename_base = os.path.basename(latest_anchor_file)
-    jit_id_match = re.search(r"(module.*jit_f\.[^.]+)", filename_base)
+    jit_id_match = _XLA_DUMP_JIT_ID_RE.search(filename_base)
 
     if not jit_id_match:
         print(
@@ -273,42 +301,63 @@ def rename_xla_dump(
 
     new_base_name = f"{benchmark_name}_{serialized_benchmark_param}"
 
-    for original_filepath in all_related_files:
-        original_filename = os.path.basename(original_filepath)
-
-        # Find the specific suffix part *after* the common_jit_id_prefix.
-        # This regex looks for the common_jit_id_prefix, then captures everything after it,
-        # ensuring it starts with a dot if there's more.
-        # Example: if original_filename is 'module_0080.jit_f.cl_747713181.after_codegen.txt'
-        # and common_jit_id_prefix is 'jit_f.cl_747713181'
-        # we want to capture '.after_codegen.txt'
-        suffix_match = re.search(
-            re.escape(common_jit_id_prefix) + r"(\..*)", original_filename
-        )
+    # Find the specific suffix part *after* the common_jit_id_prefix.
+    # This regex looks for the common_jit_id_prefix, then captures everything after it,
+    # ensuring it starts with a dot if there's more.
+    # Example: if original_filename is 'module_0080.jit_f.cl_747713181.after_codegen.txt'
+    # and common_jit_id_prefix is 'jit_f.cl_747713181'
+    # we want to capture '.after_codegen.txt'
+    # The pattern is shared by every related file, so compile it once.
+    suffix_pattern = re.compile(re.escape(common_jit_id_prefix) + r"(\..*)")
+
+    # Files bound for remote storage are staged locally under their new names
+    # and uploaded together, instead of spawning one gsutil process per file.
+    upload_to_remote = not is_local_directory_path(dest_xla_dump_dir)
+    copy_dir = tempfile.mkdtemp() if upload_to_remote else dest_xla_dump_dir
+    staged_filepaths = []
+
+    try:
+        for original_filepath in all_related_files:
+            original_filename = os.path.basename(original_filepath)
 
-        if suffix_match:
-            original_suffix_with_extension = suffix_match.group(
-                1
-            )  # e.g., '.after_codegen.txt'
+            suffix_match = suffix_pattern.search(original_filename)
 
-        new_filename = f"{new_base_name}{original_suffix_with_extension}"
-        new_filepath = os.path.join(dest_xla_dump_dir, new_filename)
+            if suffix_match:
+                original_suffix_with_extension = suffix_match.group(
+                    1
+                )  # e.g., '.after_codegen.txt'
 
-        if original_filepath == new_filepath:
-            print(
-                f"Skipping: '{original_filename}' already has the desired name or path."
-            )
-            continue
+            new_filename = f"{new_base_name}{original_suffix_with_extension}"
+            new_filepath = os.path.join(dest_xla_dump_dir, new_filename)
 
-        # Copy the renamed files to desired location
-        if is_local_directory_path(dest_xla_dump_dir):
+            if original_filepath == new_filepath:
+                print(
+                    f"Skipping: '{original_filename}' already has the desired name"
+                    " or path."
+                )
+                continue
+
+            # Copy the renamed files to desired location
             try:
-                os.makedirs(dest_xla_dump_dir, exist_ok=True)
-                shutil.copy(original_filepath, new_filepath)
+                os.makedirs(copy_dir, exist_ok=True)
+                copied_filepath = os.path.join(copy_dir, new_filename)
+                shutil.copy(original_filepath, copied_filepath)
+                staged_filepaths.append(copied_filepath)
             except Exception as e:
                 print(
-                    f"An unexpected error occurred while copy '{original_filepath}': {e}"
+                    "An unexpected error occurred while copy"
+                    f" '{original_filepath}': {e}"
+                )
+
+        if upload_to_remote:
+            if staged_filepaths:
+                # The trailing slash makes gsutil treat the destination as a folder,
+                # even when only one file is uploaded.
+                upload_to_storage(
+                    trace_dir=dest_xla_dump_dir.rstrip("/") + "/",
+                    local_file=staged_filepaths,
                 )
-        else:
-            upload_to_storage(trace_dir=new_filepath, local_file=original_filepath)
+    finally:
+        if upload_to_remote:
+            shutil.rmtree(copy_dir, ignore_errors=True)
     print(f"The XLA dump is stored in {dest_xla_dump_dir}")
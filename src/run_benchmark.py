@@ -5,21 +5,38 @@ Sample usage (on TPU vm):
 """
 
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 import csv
+import dataclasses
 import datetime
+import functools
 import importlib
 import inspect
 import itertools
-import random
-import string
-from typing import Any, Callable, Dict, List, Tuple
-from benchmark_utils import maybe_write_metrics_file, rename_xla_dump
-import jax
-import yaml
-import ray
-from concurrent.futures import ThreadPoolExecutor
+import json
+import math
 import os
-import copy
+import time
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple
+import uuid
+
+# Always dump HLOs. XLA reads XLA_FLAGS once, when jax initializes, so this is
+# set before any import below that could pull in jax.
+TMP_XLA_DUMP_DIR = "/tmp/microbenchmarks/hlo_graphs"
+os.environ["XLA_FLAGS"] = f"--xla_dump_to={TMP_XLA_DUMP_DIR}"
+# One key per finished (benchmark, parameter point), for --incremental reruns.
+COMPLETED_POINTS_FILE = "/tmp/microbenchmarks/completed_points.jsonl"
+
+# pylint: disable=g-import-not-at-top
+import numpy as np
+import yaml
+
+# Prefer the libyaml-backed loader; fall back to the pure-Python one.
+try:
+    from yaml import CSafeLoader as SafeLoader  # pylint: disable=g-importing-member
+except ImportError:
+    from yaml import SafeLoader  # pylint: disable=g-importing-member
+# pylint: enable=g-import-not-at-top
 
 
 COLLECTIVE_BENCHMARK_MAP = {
@@ -58,34 +75,54 @@ ATTENTION_BENCHMARK_MAP = {
 HBM_BENCHMARK_MAP = {
     "single_chip_hbm_copy": "benchmark_hbm.single_chip_hbm_copy",
 }
-BENCHMARK_MAP = {}
-BENCHMARK_MAP.update(COLLECTIVE_BENCHMARK_MAP)
-BENCHMARK_MAP.update(MATMUL_BENCHMARK_MAP)
-BENCHMARK_MAP.update(CONVOLUTION_BENCHMARK_MAP)
-BENCHMARK_MAP.update(ATTENTION_BENCHMARK_MAP)
-BENCHMARK_MAP.update(HBM_BENCHMARK_MAP)
-
-
-# Mapping from dtype string to actual dtype object
-dtype_mapping = {
-    "bfloat16": jax.numpy.bfloat16,
-    "float32": jax.numpy.float32,
-    "int32": jax.numpy.int32,
-    # Add other dtypes as needed
+BENCHMARK_MAP = {
+    **COLLECTIVE_BENCHMARK_MAP,
+    **MATMUL_BENCHMARK_MAP,
+    **CONVOLUTION_BENCHMARK_MAP,
+    **ATTENTION_BENCHMARK_MAP,
+    **HBM_BENCHMARK_MAP,
 }
 
-# Always dump HLOs
-TMP_XLA_DUMP_DIR = "/tmp/microbenchmarks/hlo_graphs"
-os.environ["XLA_FLAGS"] = f"--xla_dump_to={TMP_XLA_DUMP_DIR}"
+
+@functools.lru_cache(maxsize=None)
+def get_dtype_mapping() -> Dict[str, Any]:
+    """Mapping from dtype string to actual dtype object.
+
+    Built on first use, so this module does not import jax at load time.
+    """
+    import jax.numpy as jnp  # pylint: disable=g-import-not-at-top
+
+    return {
+        "bfloat16": jnp.bfloat16,
+        "float32": jnp.float32,
+        "int32": jnp.int32,
+        # Add other dtypes as needed
+    }
+
+
+UTC = datetime.timezone.utc
+
+# Benchmark parameters that are not passed to calculate_metrics functions.
+BENCHMARK_PARAMS_TO_FILTER = frozenset(("num_runs", "trace_dir"))
+
+# Prefix of parameter values that copy another parameter, e.g. "SAME_AS_m".
+SAME_AS_PREFIX = "SAME_AS_"
+
+
+def get_utc_timestamp() -> str:
+    """Return the current UTC time as the timestamp string used in metrics."""
+    # "Z" indicates UTC
+    return datetime.datetime.now(tz=UTC).isoformat() + "Z"
 
 
 def get_benchmark_config(config_path: str) -> Dict[str, Any]:
     """Load benchmark configuration from a YAML file."""
     with open(config_path, "r") as file:
-        return yaml.safe_load(file)
+        return yaml.load(file, Loader=SafeLoader)
 
 
 # Dynamically load the benchmark functions.
+@functools.lru_cache(maxsize=None)
 def get_benchmark_functions(
     benchmark_name: str,
 ) -> Tuple[Callable[..., Any], Callable[..., Any]]:
@@ -120,22 +157,20 @@ def get_benchmark_functions(
 
 
 def preprocess_benchmark_param(
-    benchmark_param: Dict[str, Any], trace_dir: string = None
+    benchmark_param: Dict[str, Any], trace_dir: str = None
 ) -> Dict[str, Any]:
     """Preprocess the benchmark parameter before running the benchmark."""
-    if "dtype" in benchmark_param:
-        dtype_str = benchmark_param["dtype"]
-        if dtype_str in dtype_mapping:
-            benchmark_param["dtype"] = dtype_mapping[dtype_str]
-        else:
-            raise ValueError(f"Unsupported dtype: {dtype_str}")
-
-    # Handle "SAME_AS_" parameters.
+    # Resolve "dtype" and "SAME_AS_" parameters in a single pass.
     # For example, if "n" is "SAME_AS_m", then "n" will
     # be set to the same value as "m".
     for key, value in benchmark_param.items():
-        if isinstance(value, str) and value.startswith("SAME_AS_"):
-            same_as_key = value.split("SAME_AS_")[1]
+        if key == "dtype":
+            dtype_mapping = get_dtype_mapping()
+            if value not in dtype_mapping:
+                raise ValueError(f"Unsupported dtype: {value}")
+            benchmark_param[key] = dtype_mapping[value]
+        elif isinstance(value, str) and value.startswith(SAME_AS_PREFIX):
+            same_as_key = value[len(SAME_AS_PREFIX) :]
             if same_as_key not in benchmark_param:
                 raise ValueError(
                     f"Parameter {same_as_key} not found in the benchmark_param."
@@ -146,6 +181,35 @@ def preprocess_benchmark_param(
     return benchmark_param
 
 
+def generate_sweep_values(
+    start: Any, end: Any, multiplier: Any = None, increase_by: Any = None
+) -> List[Any]:
+    """Generate the values of a swept parameter from start up to and including end."""
+    if multiplier:
+        if start <= 0 or multiplier <= 1:
+            raise ValueError(
+                "In sweep mode, multiplier must be greater than 1 and start must be"
+                " positive."
+            )
+        if end < start:
+            return []
+        # One extra term covers rounding in the log; it is filtered out below.
+        # Python numbers keep large integer terms from overflowing int64.
+        num_values = int(math.log(end / start, multiplier)) + 2
+        param_values = [start * multiplier**i for i in range(num_values)]
+        return [value for value in param_values if value <= end]
+    elif increase_by:
+        if increase_by <= 0:
+            raise ValueError("In sweep mode, increase_by must be positive.")
+        param_values = np.arange(start, end + increase_by, increase_by)
+    else:
+        raise ValueError(
+            "In sweep mode, user must provide either multiplier or increase_by value."
+        )
+    # Drop any value past the end of the range, e.g. from floating point steps.
+    return param_values[param_values <= end].tolist()
+
+
 def generate_benchmark_params_sweeping(
     benchmark_sweep_params: List[Dict[str, Any]],
 ) -> List[Dict[str, Any]]:
@@ -163,22 +227,10 @@ def generate_benchmark_params_sweeping(
                 end = value.get("end")
                 multiplier = value.get("multiplier", None)
                 increase_by = value.get("increase_by", None)
-                # Generate values in the range
-                param_values = []
-                current_value = start
-                while current_value <= end:
-                    param_values.append(current_value)
-                    if multiplier:
-                        current_value *= multiplier
-                    elif increase_by:
-                        current_value += increase_by
-                    else:
-                        raise ValueError(
-                            "In sweep mode, user must provide either multiplier or"
-                            " increase_by value."
-                        )
                 # Add the generated values to the param set
-                param_sets[key] = param_values
+                param_sets[key] = generate_sweep_values(
+                    start, end, multiplier=multiplier, increase_by=increase_by
+                )
             else:
                 # If it's not a range, just add it as a list with one element
                 param_sets[key] = [value]
@@ -205,31 +257,109 @@ def write_to_csv(csv_path: str, calculate_metrics_results: List[Dict[str, Any]])
     # Open the CSV file for writing
     with open(csv_path, mode="w", newline="") as csv_file:
         # Use the keys from the first item as the headers
+        headers = list(calculate_metrics_results[0].keys())
 
-        headers = calculate_metrics_results[0].keys()
+        writer = csv.writer(csv_file)
+        writer.writerow(headers)  # Write the header row
 
-        # Initialize a DictWriter with the headers
-        writer = csv.DictWriter(csv_file, fieldnames=headers)
-        writer.writeheader()  # Write the header row
-
-        # Iterate through each result and write to the CSV
-        for each in calculate_metrics_results:
-            writer.writerow(each)  # Write each row
+        # Write all results in one call, with values ordered by the headers
+        writer.writerows(
+            [each.get(header) for header in headers]
+            for each in calculate_metrics_results
+        )
     print(f"Metrics written to CSV at {csv_path}.")
 
 
-def run_single_benchmark(benchmark_config: Dict[str, Any]):
-    """Run a single benchmark with one or more configurations."""
+def get_benchmark_overhead_ms(
+    wall_time_ms: float, benchmark_results: Dict[str, Any]
+) -> Optional[float]:
+    """Return the wall time of a benchmark call not spent in its measured runs.
+
+    For untraced runs this is the setup, compilation, warmup and dispatch cost
+    around the timed runs. A point where it dwarfs the measured time is too
+    small to amortize the fixed overhead. The *time_ms_list results must cover
+    every timed run of the call. Returns None if there are none.
+    """
+    measured_ms = [
+        sum(value)
+        for key, value in benchmark_results.items()
+        if key.endswith("time_ms_list") and value
+    ]
+    if not measured_ms:
+        return None
+    return wall_time_ms - sum(measured_ms)
+
+
+def get_point_key(
+    config_path: Optional[str],
+    benchmark_config: Dict[str, Any],
+    benchmark_param: Dict[str, Any],
+) -> str:
+    """Return a stable key for one sweep point of a benchmark.
+
+    The key covers the config file and every setting of the benchmark besides
+    its parameter lists, so points whose results go to other output dirs or
+    come from another config are not mistaken for completed ones.
+    """
+    benchmark_settings = {
+        key: value
+        for key, value in benchmark_config.items()
+        if key not in ("benchmark_params", "benchmark_sweep_params")
+    }
+    if config_path:
+        config_path = os.path.abspath(config_path)
+    return json.dumps(
+        [config_path, benchmark_settings, benchmark_param], sort_keys=True, default=str
+    )
+
+
+def load_completed_points() -> FrozenSet[str]:
+    """Return the keys of the points finished by earlier runs."""
+    try:
+        with open(COMPLETED_POINTS_FILE, "r") as file:
+            return frozenset(json.loads(line) for line in file if line.strip())
+    except FileNotFoundError:
+        return frozenset()
+
+
+def mark_points_completed(point_keys: List[str]):
+    """Record finished points so that an --incremental rerun skips them."""
+    if not point_keys:
+        return
+    os.makedirs(os.path.dirname(COMPLETED_POINTS_FILE), exist_ok=True)
+    with open(COMPLETED_POINTS_FILE, "a") as file:
+        file.writelines(json.dumps(point_key) + "\n" for point_key in point_keys)
+
+
+@dataclasses.dataclass(frozen=True)
+class BenchmarkPlan:
+    """Everything resolved from one benchmark config before any point runs."""
+
+    benchmark_name: str
+    benchmark_func: Callable[..., Any]
+    calculate_metrics_func: Callable[..., Any]
+    # Parameter names accepted by calculate_metrics_func.
+    calculate_metrics_params: FrozenSet[str]
+    # One (raw params from the config, preprocessed params) pair per point.
+    param_points: List[Tuple[Dict[str, Any], Dict[str, Any]]]
+    csv_path: Optional[str] = None
+    xlml_metrics_dir: Optional[str] = None
+    xla_dump_dir: Optional[str] = None
+
+
+def build_benchmark_plan(benchmark_config: Dict[str, Any]) -> BenchmarkPlan:
+    """Resolve a benchmark config into a BenchmarkPlan.
+
+    All per-config work happens here, so an invalid benchmark name, dtype or
+    SAME_AS_ reference fails before the first point runs.
+    """
     # Extract benchmark details
     benchmark_name = benchmark_config.get("benchmark_name")
     benchmark_params = benchmark_config.get("benchmark_params", [])
     benchmark_sweep_params = benchmark_config.get("benchmark_sweep_params", {})
     if benchmark_sweep_params:
         benchmark_params += generate_benchmark_params_sweeping(benchmark_sweep_params)
-    csv_path = benchmark_config.get("csv_path")
     trace_dir = benchmark_config.get("trace_dir")
-    xlml_metrics_dir = benchmark_config.get("xlml_metrics_dir")
-    xla_dump_dir = benchmark_config.get("xla_dump_dir")
 
     if not benchmark_name:
         raise ValueError("Each benchmark must have a 'benchmark_name'.")
@@ -237,85 +367,240 @@ def run_single_benchmark(benchmark_config: Dict[str, Any]):
     # Get the benchmark function
     benchmark_func, calculate_metrics_func = get_benchmark_functions(benchmark_name)
 
-    print(f"\n{'=' * 30}Starting benchmark '{benchmark_name}'{'=' * 30}\n")
-
-    # Run the benchmark
-    calculate_metrics_results = []
+    param_points = []
     for benchmark_param in benchmark_params:
-        original_benchmark_param = copy.deepcopy(benchmark_param)
-        benchmark_param = preprocess_benchmark_param(
-            benchmark_param, trace_dir=trace_dir
-        )
-        print(f"Running benchmark: {benchmark_name} with params: {benchmark_param}")
-        test_start_time = (
-            datetime.datetime.now(tz=datetime.timezone.utc).isoformat() + "Z"
-        )  # "Z" indicates UTC
-        benchmark_results = benchmark_func(**benchmark_param)
-        test_end_time = (
-            datetime.datetime.now(tz=datetime.timezone.utc).isoformat() + "Z"
+        # preprocess_benchmark_param only rebinds top-level keys, so a shallow
+        # copy is enough to keep the raw values for naming the XLA dump.
+        original_benchmark_param = dict(benchmark_param)
+        param_points.append(
+            (
+                original_benchmark_param,
+                preprocess_benchmark_param(benchmark_param, trace_dir=trace_dir),
+            )
         )
 
-        # Filter benchmark_results to include only keys present in
-        # calculate_metrics_func
-        calculate_metrics_params = inspect.signature(calculate_metrics_func).parameters
-        filtered_benchmark_results = {
-            key: value
-            for key, value in benchmark_results.items()
-            if key in calculate_metrics_params
-        }
-        # Filter out certain parameters from benchmark_param, eg. "num_runs".
-        benchmark_params_to_filter = ["num_runs", "trace_dir"]
-        filtered_benchmark_param = {
-            key: value
-            for key, value in benchmark_param.items()
-            if key not in benchmark_params_to_filter
-        }
-        metadata, metrics = calculate_metrics_func(
-            **filtered_benchmark_param, **filtered_benchmark_results
-        )
-        calculate_metrics_results.append({"metadata": metadata, "metrics": metrics})
-        if xlml_metrics_dir:
-            maybe_write_metrics_file(
-                xlml_metrics_dir,
-                metrics,
-                metadata,
-                benchmark_name,
-                test_start_time,
-                test_end_time,
-            )
-        # Post process the xla dump
-        if xla_dump_dir:
-            rename_xla_dump(
-                tmp_xla_dump_dir=TMP_XLA_DUMP_DIR,
-                dest_xla_dump_dir=xla_dump_dir,
-                benchmark_name=benchmark_name,
-                benchmark_param=original_benchmark_param,
-            )
+    return BenchmarkPlan(
+        benchmark_name=benchmark_name,
+        benchmark_func=benchmark_func,
+        calculate_metrics_func=calculate_metrics_func,
+        calculate_metrics_params=frozenset(
+            inspect.signature(calculate_metrics_func).parameters
+        ),
+        param_points=param_points,
+        csv_path=benchmark_config.get("csv_path"),
+        xlml_metrics_dir=benchmark_config.get("xlml_metrics_dir"),
+        xla_dump_dir=benchmark_config.get("xla_dump_dir"),
+    )
 
-    # Dump metrics to file.
-    if csv_path:
-        test_name = f"t_{benchmark_name}_" + "".join(
-            random.choices(string.ascii_uppercase + string.digits, k=10)
+
+def run_single_benchmark(
+    benchmark_config: Dict[str, Any],
+    dry_run: bool = False,
+    completed_points: FrozenSet[str] = frozenset(),
+    config_path: Optional[str] = None,
+):
+    """Run a single benchmark with one or more configurations.
+
+    With dry_run, the benchmark and its parameters are resolved and listed, but
+    nothing is run. Points whose key is in completed_points are skipped; keys
+    are scoped to config_path.
+    """
+    # benchmark_utils imports jax, so load it only once a benchmark actually runs.
+    from benchmark_utils import (  # pylint: disable=g-import-not-at-top
+        build_metrics_record,
+        maybe_write_metrics_records,
+        rename_xla_dump,
+    )
+
+    plan = build_benchmark_plan(benchmark_config)
+    benchmark_name = plan.benchmark_name
+
+    if dry_run:
+        print(
+            f"Dry run: '{benchmark_name}' would run {len(plan.param_points)}"
+            " parameter point(s):"
         )
-        write_to_csv(f"{csv_path}/{test_name}.csv", calculate_metrics_results)
+        for original_benchmark_param, _ in plan.param_points:
+            point_key = get_point_key(
+                config_path, benchmark_config, original_benchmark_param
+            )
+            skipped = " (completed, skipped)" if point_key in completed_points else ""
+            print(f"  {original_benchmark_param}{skipped}")
+        return
 
+    print(f"\n{'=' * 30}Starting benchmark '{benchmark_name}'{'=' * 30}\n")
 
-def main(config_path: str, multithreaded: bool):
+    # Run the benchmark
+    calculate_metrics_results = []
+    # XLML metrics records are buffered and appended to the JSONL file once per
+    # benchmark, including when a sweep point fails part way through.
+    metrics_records = []
+    completed_point_keys = []
+    try:
+        for original_benchmark_param, benchmark_param in plan.param_points:
+            point_key = get_point_key(
+                config_path, benchmark_config, original_benchmark_param
+            )
+            if point_key in completed_points:
+                print(
+                    f"Skipping completed point of {benchmark_name}:"
+                    f" {original_benchmark_param}"
+                )
+                continue
+            print(f"Running benchmark: {benchmark_name} with params: {benchmark_param}")
+            test_start_time = get_utc_timestamp()
+            call_start = time.perf_counter()
+            benchmark_results = plan.benchmark_func(**benchmark_param)
+            wall_time_ms = (time.perf_counter() - call_start) * 1000
+            test_end_time = get_utc_timestamp()
+
+            # Filter benchmark_results to include only keys present in
+            # calculate_metrics_func
+            filtered_benchmark_results = {
+                key: value
+                for key, value in benchmark_results.items()
+                if key in plan.calculate_metrics_params
+            }
+            # Filter out certain parameters from benchmark_param, eg. "num_runs".
+            filtered_benchmark_param = {
+                key: value
+                for key, value in benchmark_param.items()
+                if key not in BENCHMARK_PARAMS_TO_FILTER
+            }
+            metadata, metrics = plan.calculate_metrics_func(
+                **filtered_benchmark_param, **filtered_benchmark_results
+            )
+            # With a trace_dir, the call also profiles, parses and uploads the
+            # trace, which would swamp the overhead, so it is not reported.
+            overhead_ms = (
+                None
+                if benchmark_param.get("trace_dir")
+                else get_benchmark_overhead_ms(wall_time_ms, benchmark_results)
+            )
+            if overhead_ms is not None:
+                metrics["benchmark_overhead_ms"] = overhead_ms
+                print(
+                    f"Overhead outside the measured runs: {overhead_ms:.3f} ms"
+                    f" ({overhead_ms / wall_time_ms:.1%} of the benchmark call)"
+                )
+            calculate_metrics_results.append({"metadata": metadata, "metrics": metrics})
+            if plan.xlml_metrics_dir:
+                metrics_records.append(
+                    build_metrics_record(
+                        metrics,
+                        metadata,
+                        benchmark_name,
+                        test_start_time,
+                        test_end_time,
+                    )
+                )
+            # Post process the xla dump
+            if plan.xla_dump_dir:
+                rename_xla_dump(
+                    tmp_xla_dump_dir=TMP_XLA_DUMP_DIR,
+                    dest_xla_dump_dir=plan.xla_dump_dir,
+                    benchmark_name=benchmark_name,
+                    benchmark_param=original_benchmark_param,
+                )
+            completed_point_keys.append(point_key)
+    finally:
+        if plan.xlml_metrics_dir:
+            maybe_write_metrics_records(plan.xlml_metrics_dir, metrics_records)
+        # Dump metrics to file, including the points that ran before a failure.
+        # An --incremental rerun may have nothing new to write.
+        if plan.csv_path and calculate_metrics_results:
+            test_name = f"t_{benchmark_name}_{uuid.uuid4().hex[:10].upper()}"
+            write_to_csv(f"{plan.csv_path}/{test_name}.csv", calculate_metrics_results)
+        # Points are only marked once their results are written, so a rerun
+        # never skips a point whose output was lost.
+        mark_points_completed(completed_point_keys)
+
+
+def enable_persistent_compilation_cache(cache_dir: str):
+    """Enable JAX's persistent compilation cache, so reruns reuse executables.
+
+    This must run before any benchmark compiles. Programs loaded from the cache
+    are not recompiled, so XLA does not dump their HLO again.
+    """
+    import jax  # pylint: disable=g-import-not-at-top
+
+    jax.config.update("jax_compilation_cache_dir", cache_dir)
+    # Cache every executable, however small or quick to compile.
+    jax.config.update("jax_persistent_cache_min_entry_size_bytes", -1)
+    jax.config.update("jax_persistent_cache_min_compile_time_secs", 0)
+    print(f"JAX persistent compilation cache enabled at {cache_dir}")
+
+
+def main(
+    config_path: str,
+    multithreaded: bool,
+    jax_cache_dir: str = None,
+    dry_run: bool = False,
+    incremental: bool = False,
+):
     """Main function."""
     # Load configuration
     config = get_benchmark_config(config_path)
     benchmarks = config.get("benchmarks")
     if not benchmarks or not isinstance(benchmarks, list):
         raise ValueError("Configuration must contain a 'benchmarks' list.")
+    # A cache hit dumps no HLO, so rename_xla_dump would file an older dump under
+    # the current point's name.
+    if jax_cache_dir and any(
+        benchmark_config.get("xla_dump_dir") for benchmark_config in benchmarks
+    ):
+        raise ValueError(
+            "--jax_cache_dir cannot be combined with xla_dump_dir: programs loaded"
+            " from the cache are not dumped again."
+        )
+    if incremental and multithreaded:
+        raise ValueError("--incremental is not supported with --multithreaded.")
+
+    # Points finished by earlier runs are only skipped with --incremental;
+    # otherwise the record of them is reset and every point runs again.
+    completed_points = load_completed_points() if incremental else frozenset()
+
+    if dry_run:
+        # Validate the config and list the sweep without touching any device.
+        for benchmark_config in benchmarks:
+            run_single_benchmark(
+                benchmark_config,
+                dry_run=True,
+                completed_points=completed_points,
+                config_path=config_path,
+            )
+        return
 
-    # Clear the tmp dirs.
-    if os.path.exists(TMP_XLA_DUMP_DIR):
-        for filename in os.listdir(TMP_XLA_DUMP_DIR):
-            file_path = os.path.join(TMP_XLA_DUMP_DIR, filename)
-            if os.path.isfile(file_path):
-                os.remove(file_path)
+    if not incremental:
+        try:
+            os.remove(COMPLETED_POINTS_FILE)
+        except FileNotFoundError:
+            pass
+
+    if jax_cache_dir:
+        enable_persistent_compilation_cache(jax_cache_dir)
+
+    if incremental:
+        import jax  # pylint: disable=g-import-not-at-top
+
+        # Each host keeps its own record of completed points. If they disagree,
+        # hosts would run different points and their collectives would hang.
+        if jax.process_count() > 1:
+            raise ValueError("--incremental is only supported on a single host.")
+
+    # Clear the tmp dirs. scandir reports the file type from the directory
+    # listing itself, so no extra stat is needed per dump file.
+    try:
+        with os.scandir(TMP_XLA_DUMP_DIR) as entries:
+            for entry in entries:
+                if entry.is_file(follow_symlinks=False):
+                    os.unlink(entry.path)
+    except FileNotFoundError:
+        pass  # Nothing to clear on the first run.
 
     if multithreaded:
+        import ray  # pylint: disable=g-import-not-at-top
+
         ray.init(
             runtime_env=ray.runtime_env.RuntimeEnv(
                 address="ray://tpu-ray-cluster-head-svc:10001",
@@ -338,10 +623,16 @@ def main(config_path: str, multithreaded: bool):
 
     else:
         for benchmark_config in benchmarks:
-            run_single_benchmark(benchmark_config)
+            run_single_benchmark(
+                benchmark_config,
+                completed_points=completed_points,
+                config_path=config_path,
+            )
 
 
 def run_benchmark_multithreaded(benchmark_config):
+    import ray  # pylint: disable=g-import-not-at-top
+
     # Extract benchmark details
     benchmark_name = benchmark_config.get("benchmark_name")
     benchmark_params = benchmark_config.get("benchmark_params", [])
@@ -354,13 +645,14 @@ def run_benchmark_multithreaded(benchmark_config):
 
     # Get the benchmark function
     benchmark_func, calculate_metrics_func = get_benchmark_functions(benchmark_name)
+    calculate_metrics_params = frozenset(
+        inspect.signature(calculate_metrics_func).parameters
+    )
 
     print(f"\n{'=' * 30}Starting benchmark '{benchmark_name}'{'=' * 30}\n")
 
     # Start a trace if requested
-    test_name = f"t_{benchmark_name}_" + "".join(
-        random.choices(string.ascii_uppercase + string.digits, k=10)
-    )
+    test_name = f"t_{benchmark_name}_{uuid.uuid4().hex[:10].upper()}"
 
     # Preprocess benchmark parameters
     preprocessed_benchmark_params = [
@@ -390,9 +682,6 @@ def run_benchmark_multithreaded(benchmark_config):
             benchmark_results = future.result()  # Get the result from the future
 
             # Filter benchmark_results to include only keys present in calculate_metrics_func
-            calculate_metrics_params = inspect.signature(
-                calculate_metrics_func
-            ).parameters
             filtered_benchmark_results = {
                 key: value
                 for key, value in benchmark_results.items()
@@ -425,5 +714,37 @@ if __name__ == "__main__":
         default=False,
         help="Path to the YAML configuration file.",
     )
+    parser.add_argument(
+        "--jax_cache_dir",
+        type=str,
+        default=None,
+        help=(
+            "Directory for JAX's persistent compilation cache. Reruns skip XLA"
+            " compilation for cached programs. Not supported with xla_dump_dir."
+        ),
+    )
+    parser.add_argument(
+        "--dry_run",
+        action="store_true",
+        help=(
+            "Validate the config and list the parameter points of each benchmark"
+            " without running them."
+        ),
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help=(
+            "Skip the parameter points that a previous run of the same config"
+            " already completed. Single host only; not supported with"
+            " --multithreaded."
+        ),
+    )
     args = parser.parse_args()
-    main(args.config, args.multithreaded)
+    main(
+        args.config,
+        args.multithreaded,
+        jax_cache_dir=args.jax_cache_dir,
+        dry_run=args.dry_run,
+        incremental=args.incremental,
+    )